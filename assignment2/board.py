@@ -12,14 +12,27 @@ Implements a basic Go board with functions to:
 The board uses a 1-dimensional representation with padding
 """
 
-from typing import List
+from operator import xor
+from typing import List, Tuple
 
 import numpy as np
 from board_base import (BLACK, BORDER, EMPTY, GO_COLOR, GO_POINT, MAXSIZE,
                         NO_POINT, WHITE, board_array_size, coord_to_point,
-                        is_black_white, is_black_white_empty, opponent,
                         where1d)
 
+"""
+Opponent of each color, indexed by color: _OPPONENT[color] is the same as
+board_base.opponent(color) for BLACK and WHITE, without the function call.
+"""
+_OPPONENT = (EMPTY, WHITE, BLACK)
+
+"""
+Second seed word for the side-to-move Zobrist keys: the generator is seeded
+with [size, _ZOBRIST_TO_PLAY_SEED], a different stream from the point keys,
+which are seeded with the board size alone.
+"""
+_ZOBRIST_TO_PLAY_SEED = 1
+
 """
 The GoBoard class implements a board and basic functions to play
 moves, check the end of the game, and count the acore at the end.
@@ -39,97 +52,29 @@ class GoBoard(object):
         self.reset(size)
         self.tt = tt
 
+    def tt_key(self) -> int:
+        """
+        Return the canonical transposition table key of the current board state:
+        the smallest of the hashes of its 8 symmetric transformations
+        (4 rotations + 4 mirror images), combined with the key of the player to move.
+        All symmetric boards with the same player to move share this key.
+        """
+        return min(self.hashes) ^ self.zobrist_to_play[self.current_player]
+
+
     def set_tt_entry(self, color):
         """
-        Adds 8 transposition table entries 
-        (4 rotations for current board state + 4 for current board state's mirror image)
-        """
-        #[1,2,3,4,5,6,7,8,9]
-        num_string1=""
-        num_string2=""
-        num_string3=""
-        num_string4=""
-        for i in range(self.size):
-            for j in range(self.size):
-                size_times_j = j*self.size
-                
-                #123456789
-                num_string1 += str(self.board[self.non_border_points[i*self.size+j]])
-                #321654987
-                num_string2 += str(self.board[self.non_border_points[(i+1)*self.size-j-1]])
-                #147258369
-                num_string3 += str(self.board[self.non_border_points[i+size_times_j]])
-                #741852963
-                num_string4 += str(self.board[self.non_border_points[self.size_times_times_minus_one+i-size_times_j]])
-
-        #add the reverse of each num_string
-        for key in [num_string1,num_string2,num_string3,num_string4]:
-            self.tt[key] = color
-            self.tt[key[::-1]] = color
+        Adds a single transposition table entry for the current board state,
+        under its canonical key, so it is shared by all 8 symmetric board states.
+        """
+        self.tt[self.tt_key()] = color
 
 
     def get_tt_entry(self):
         """
         If stored in the transposition table, return the outcome (1 or 2) for the current board state, else return None.
         """
-        arr = []
-        for point in self.non_border_points:
-            arr.append(self.board[point])
-        key = ''.join(str(i) for i in arr)
-        return self.tt.get(key)
-
-
-    # def get_board_value(self) -> int:
-    #     # do math to board state such that the board state becomes a dict key
-    #     arr = []
-    #     for point in self.non_border_points:
-    #         arr.append(self.board[point])
-
-    #     return ''.join(str(i) for i in arr)
-
-
-    # def board_to_keys(self):
-
-    #     #[1,2,3,4,5,6,7,8,9]
-    #     num_string1=""
-    #     num_string2=""
-    #     num_string3=""
-    #     num_string4=""
-    #     for i in range(self.size):
-    #         for j in range(self.size):
-                
-    #             #123456789
-    #             num_string1 += str(self.board[self.non_border_points[i*self.size+j]])
-    #             #321654987
-    #             num_string2 += str(self.board[self.non_border_points[(i+1)*self.size-j-1]])
-    #             #147258369
-    #             num_string3 += str(self.board[self.non_border_points[i+self.size*j]])
-    #             #741852963
-    #             num_string4 += str(self.board[self.non_border_points[self.size*(self.size-1)+i-j*self.size]])
-
-    #     keys = [num_string1,num_string2,num_string3,num_string4]
-    #     #add the reverse of each num_string
-    #     for num_string in [num_string1,num_string2,num_string3,num_string4]:
-    #         keys.append(num_string[::-1])
-        
-    #     return keys
-
-
-    # def board_to_keys(self):
-        
-    #     twoD_board = self.get_twoD_board()
-    #     flipped_twoD_board = np.flipud(twoD_board)
-
-    #     v1 = self.get_board_value(twoD_board)
-    #     v2 = self.get_board_value(flipped_twoD_board)
-    #     keys = [v1,v2]
-
-    #     for board in [twoD_board,flipped_twoD_board]:
-    #         for _ in range(3): # only three unique rotations possible
-    #             board = np.rot90(board)
-    #         v = self.get_board_value(board)
-    #         keys.append(v)
-    #     return keys
+        return self.tt.get(self.tt_key())
 
 
     def reset(self, size: int) -> None:
@@ -143,19 +88,40 @@ class GoBoard(object):
         self.maxpoint: int = board_array_size(size)
         self.board: np.ndarray[GO_POINT] = np.full(self.maxpoint, BORDER, dtype=GO_POINT)
         self._initialize_empty_points(self.board)
-        self.non_border_neighbors: dict = self._initialize_non_border_neighbors_dict()
-        self.non_border_points: list = list(self.non_border_neighbors.keys())
+        self.non_border_points: list = where1d(self.board == EMPTY).tolist()
+        self.non_border_neighbors: list = self._initialize_non_border_neighbors_table()
+        self.non_border_diag_neighbors, self.diag_at_edge = self._initialize_diag_neighbors_tables()
         self.num_non_border_points = len(self.non_border_points)
-        self.size_times_times_minus_one = self.size*(self.size-1)
+        # EMPTY points, kept up to date by play_move/undo_move
+        self._empty_set: set = set(self.non_border_points)
+        # bitboards, as Python ints with bit p set for point p
+        self.point_bits: list = [1 << point for point in range(self.maxpoint)]
+        self.neighbor_masks: list = [sum(self.point_bits[nb] for nb in nbs) for nbs in self.non_border_neighbors]
+        # points with a BORDER diagonal neighbor, as in diag_at_edge
+        self.diag_at_edge_bits: int = sum(self.point_bits[p] for p in self.non_border_points if self.diag_at_edge[p])
+        # EMPTY/BLACK/WHITE points indexed by color, kept up to date by play_move/undo_move
+        self.bitboards: list = [sum(self.point_bits[p] for p in self.non_border_points), 0, 0]
+        self.sym_points: np.ndarray = self._initialize_sym_points()
+        self.zobrist: np.ndarray = self._initialize_zobrist_table()
+        self.zobrist_moves: list = self._initialize_zobrist_moves()
+        self.zobrist_to_play: list = self._initialize_zobrist_to_play()
+        # Zobrist hashes of the 8 symmetric transformations of the board, kept up to date by play_move/undo_move
+        self.hashes: list = [int(np.bitwise_xor.reduce(self.zobrist[self.sym_points[0], EMPTY]))] * 8
         
         
     def copy(self) -> 'GoBoard':
-        b = GoBoard(self.size)
-        assert b.NS == self.NS
-        assert b.WE == self.WE
-        b.current_player = self.current_player
-        assert b.maxpoint == self.maxpoint
+        """
+        Return a copy of the board that shares the transposition table.
+        The board topology (neighbor tables, symmetry and Zobrist tables) is
+        never modified after reset, so it is shared instead of rebuilt;
+        only the mutable state is copied.
+        """
+        b = GoBoard.__new__(GoBoard)
+        b.__dict__.update(self.__dict__)
         b.board = np.copy(self.board)
+        b._empty_set = set(self._empty_set)
+        b.bitboards = list(self.bitboards)
+        # self.hashes is replaced, never mutated, by play_move/undo_move, so it can be shared
         return b
 
         
@@ -166,150 +132,121 @@ class GoBoard(object):
         return coord_to_point(row, col, self.size)
 
 
-    # def is_legal_original(self, point: GO_POINT, color: GO_COLOR) -> bool:
-    #     """
-    #     Play a move of color on point
-    #     Returns whether move was legal
-    #     """
-        
-    #     assert is_black_white(color)
-        
-    #     if self.board[point] != EMPTY:
-    #         return False
-            
-    #     opp_color = opponent(color)
-    #     in_enemy_eye = self._is_surrounded(point, opp_color) # True if all surrounding stones are either BORDER or opponent(color)
-    #     self.board[point] = color
-    #     neighbors = self._neighbors(point)
-        
-    #     #check for capturing
-    #     for nb in neighbors:
-    #         # only check neighboring stones of opponent(color)
-    #         if self.board[nb] == opp_color:
-    #             captured = self._detect_and_process_capture(nb) # True if opponent(color) block has zero liberties
-    #             if captured:
-    #             #undo capturing move
-    #                 self.board[point] = EMPTY
-    #                 return False
-                    
-                    
-    #     #check for suicide
-    #     block = self._block_of(point)
-    #     if not self._has_liberty(block):  
-    #         # undo suicide move
-    #         self.board[point] = EMPTY
-    #         return False
-        
-    #     #self.current_player = opponent(color)
-    #     # undo legal move
-    #     self.board[point] = EMPTY
-    #     return True
-
-
     def is_legal(self, point: GO_POINT, color: GO_COLOR) -> bool:
         """
         Check whether it is legal for color to play on point
-        This method tries to play the move on a temporary copy of the board.
-        This prevents the board from being modified by the move
+        (neither suicide nor capture, as in NoGo).
+        The move is evaluated on the bitboards only,
+        so the board is never modified.
         """
 
         assert(color == 1 or color == 2)
 
-        self.board[point] = color
+        bitboards = self.bitboards
+        bit = self.point_bits[point]
+        empty = bitboards[EMPTY] & ~bit
+        own = bitboards[color] | bit
+        opp = bitboards[_OPPONENT[color]]
 
-        empty_neighbors = set()
-        same_neighbors = set()
-        opponent_neighbors = set()
-
-        for nb in self.non_border_neighbors[point]:
-            if self.get_color(nb) == color:
-                same_neighbors.add(nb)
-            elif self.get_color(nb) == opponent(color):
-                opponent_neighbors.add(nb)
-            elif self.get_color(nb) == EMPTY:
-                empty_neighbors.add(nb)
-
-        # if stone has zero liberties
-        if not empty_neighbors:
-            # if stone is surrounded by opponent stones
-            if not same_neighbors:
-                # move is either suicide or capture
-                self.board[point] = EMPTY
-                return False
+        # suicide: the block of the new stone must keep at least one liberty
+        block = self._flood(bit, own)
+        if not self._dilate(block) & empty:
+            return False
 
-            # else point is surrounded and has at least one neighbor that is own color
-            # determine if block for own color has any liberties
-            visited = set()
-            for nb in same_neighbors:
-                if nb not in visited:
-                    is_liberty, visited = self.depth_first_liberty_search_simple(visited, nb, color)
-                    # if we have found a liberty for the block
-                    if is_liberty:
-                        break # same_neighbors are part of same block and thus, they share this liberty
-            # if entire block has no liberties
-            if not is_liberty:
-                self.board[point] = EMPTY
+        # capture: every neighboring opponent block must keep at least one liberty
+        opp_neighbors = self.neighbor_masks[point] & opp
+        while opp_neighbors:
+            block = self._flood(opp_neighbors & -opp_neighbors, opp)
+            if not self._dilate(block) & empty:
                 return False
+            # opponent neighbors in the same block share its liberty
+            opp_neighbors &= ~block
 
-        if opponent_neighbors:
-            # Check each neighboring opponent stone for capture
-            liberty_set = set()
-            for nb in opponent_neighbors: # opponent neighbors may belong to same or different block(s)
-                # if nb belongs to a block that was already found to have a liberty
-                if nb in liberty_set:
-                    continue
-                # see if block of nb has at least one liberty 
-                is_liberty, visited = self.depth_first_liberty_search(set(), liberty_set, nb, opponent(color))
-                if not is_liberty:
-                    self.board[point] = EMPTY
-                    return False
-                # else a liberty was found for the block of this neighbor
-                # Hence, all stones in visited belong to a block with at least one liberty
-                liberty_set.update(visited)
-
-        self.board[point] = EMPTY
         return True
 
-    def depth_first_liberty_search_simple(self, visited: set, stone, color) -> bool:
+    def legal_moves_bitboard(self, color: GO_COLOR) -> int:
         """
-        Search stone and its associated block for at least one liberty using dfs.
-        @return: True if at least one liberty exists, else False.
+        Return the bitboard of all points where it is legal for color to play,
+        i.e. is_legal for every EMPTY point at once.
+        Each block on the board is flooded once, instead of once per candidate move:
+        - a move is not suicide if the point has an EMPTY neighbor, or is a
+          liberty of an own block which has another liberty
+        - a move captures if the point is the only liberty of an opponent block
         """
-        
-        visited.add(stone)
-        # neighbors = self._neighbors(stone)  #TODO: start by searching for EMPTY?
-        # if EMPTY in neighbors:
-        #     return True, visited
-        for nb in self.non_border_neighbors[stone]:
-            if nb not in visited: # ignore previously visited stones
-                if self.get_color(nb) == EMPTY:
-                    return True, visited
-                if self.get_color(nb) == color:
-                    # see if this stone has at least one liberty
-                    is_liberty, visited = self.depth_first_liberty_search_simple(visited, nb, color)
-                    if is_liberty:
-                        return True, visited
-        return False, visited
-        
+        assert(color == 1 or color == 2)
 
-    def depth_first_liberty_search(self, visited: set, liberty_set: set, stone, color) -> bool:
-        """
-        Search stone and its associated block for at least one liberty using dfs.
-        @return: True if at least one liberty exists, else False.
-        """
-        if stone not in visited:
-            visited.add(stone)
-            for nb in self.non_border_neighbors[stone]:
-                if self.get_color(nb) == EMPTY:
-                    return True, visited
-                if self.get_color(nb) == color: # if nb is part of block
-                    if nb in liberty_set:
-                        return True, visited
-                    # see if this stone has at least one liberty
-                    is_liberty, visited = self.depth_first_liberty_search(visited, liberty_set, nb, color)
-                    if is_liberty:
-                        return True, visited
-        return False, visited
+        bitboards = self.bitboards
+        empty = bitboards[EMPTY]
+        own = bitboards[color]
+        opp = bitboards[_OPPONENT[color]]
+
+        NS = self.NS
+        legal = empty << 1 | empty >> 1 | empty << NS | empty >> NS
+        stones = own
+        while stones:
+            block = self._flood(stones & -stones, own)
+            liberties = self._dilate(block) & empty
+            # more than one liberty
+            if liberties & (liberties - 1):
+                legal |= liberties
+            stones &= ~block
+
+        stones = opp
+        while stones:
+            block = self._flood(stones & -stones, opp)
+            liberties = self._dilate(block) & empty
+            # exactly one liberty
+            if not liberties & (liberties - 1):
+                legal &= ~liberties
+            stones &= ~block
+
+        return legal & empty
+
+    def legal_moves(self, color: GO_COLOR) -> List[GO_POINT]:
+        """
+        Return the list of all points where it is legal for color to play,
+        in increasing point order.
+        """
+        return self._bits_to_points(self.legal_moves_bitboard(color))
+
+    def has_any_legal_move(self, color: GO_COLOR) -> bool:
+        """
+        Check whether color has at least one legal move.
+        """
+        return self.legal_moves_bitboard(color) != 0
+
+    def _bits_to_points(self, bits: int) -> List[GO_POINT]:
+        """
+        Return the points of the set bits of a bitboard, in increasing order.
+        """
+        points = []
+        while bits:
+            bit = bits & -bits
+            points.append(bit.bit_length() - 1)
+            bits ^= bit
+        return points
+
+    def _dilate(self, bits: int) -> int:
+        """
+        Return the bitboard of bits and all their (4-)neighbors.
+        BORDER points may be set in the result; callers mask it with a bitboard.
+        """
+        NS = self.NS
+        return bits | bits << 1 | bits >> 1 | bits << NS | bits >> NS
+
+    def _flood(self, seed: int, stones: int) -> int:
+        """
+        Return the bitboard of the block in stones connected to the seed bit(s).
+        Grows the seed one step in every direction at a time until a fixed point.
+        Since BORDER points are never set in stones, no row wraps around.
+        """
+        NS = self.NS
+        block = seed
+        while True:
+            grown = (block | block << 1 | block >> 1 | block << NS | block >> NS) & stones
+            if grown == block:
+                return block
+            block = grown
 
            
     def get_empty_points(self) -> np.ndarray:
@@ -317,7 +254,7 @@ class GoBoard(object):
         Return:
             The empty points on the board
         """
-        return where1d(self.board == EMPTY)
+        return np.fromiter(self._empty_set, dtype=GO_POINT, count=len(self._empty_set))
 
     def is_empty(self, point) -> bool:
         """Return: where or not the specified point is empty"""
@@ -335,29 +272,93 @@ class GoBoard(object):
         Argument
         ---------
         board: numpy array, filled with BORDER
+        Rows 1..size are written through one (size, NS) view of the array,
+        as in get_twoD_board, instead of one slice per row.
         """
-        for row in range(1, self.size + 1):
-            start: int = self.row_start(row)
-            board_array[start : start + self.size] = EMPTY
+        start: int = self.row_start(1)
+        rows: np.ndarray = board_array[start : start + self.size * self.NS].reshape(self.size, self.NS)
+        rows[:, :self.size] = EMPTY
 
-    def _initialize_non_border_neighbors_dict(self):
+    def _initialize_non_border_neighbors_table(self) -> list:
         """
-        Creates and returns a dict whose keys are non-BORDER points
-        and values are a list of non-BORDER neighbors for each point
+        Creates and returns a flat list indexed by point, holding a tuple
+        of the non-BORDER neighbors of each point (empty for BORDER points).
+        reset builds neighbor_masks, the bitboards of these neighbors used by is_legal,
+        from this table; _has_liberty also iterates it.
         ---------
-        board: numpy array, filled with BORDER
+        board: numpy array, BORDER points already set, all others EMPTY
+        """
+        table = [()] * self.maxpoint
+        for point in self.non_border_points:
+            table[point] = tuple(nb for nb in self._neighbors(point) if self.board[nb] == EMPTY)
+        return table
+
+    def _initialize_diag_neighbors_tables(self) -> Tuple[list, list]:
+        """
+        Creates and returns two flat lists indexed by point, used by is_eye:
+        - a tuple of the non-BORDER diagonal neighbors of each point
+        - 1 if at least one diagonal neighbor of the point is BORDER, else 0
+        Both are empty/0 for BORDER points.
+        """
+        diag_neighbors = [()] * self.maxpoint
+        at_edge = [0] * self.maxpoint
+        for point in self.non_border_points:
+            diags = self._diag_neighbors(point)
+            diag_neighbors[point] = tuple(d for d in diags if self.board[d] != BORDER)
+            at_edge[point] = int(len(diag_neighbors[point]) < len(diags))
+        return diag_neighbors, at_edge
+
+    def _initialize_sym_points(self) -> np.ndarray:
+        """
+        Creates and returns a C-contiguous (8, size*size) array of board points.
+        Row k lists the points of the board read in the order of the k-th
+        symmetry (4 rotations of the board + 4 rotations of its mirror image),
+        so that self.board[sym_points[k]] is the transformed board.
+        Row 0 is the identity, i.e. all non-BORDER points in order.
+        """
+        grid = np.asarray(self.non_border_points, dtype=GO_POINT).reshape(self.size, self.size)
+        mirror = np.fliplr(grid)
+        sym_points = np.empty((8, self.size * self.size), dtype=GO_POINT)
+        for k in range(4):
+            sym_points[k] = np.rot90(grid, k).ravel()
+            sym_points[4 + k] = np.rot90(mirror, k).ravel()
+        return sym_points
+
+    def _initialize_zobrist_table(self) -> np.ndarray:
+        """
+        Creates and returns a (maxpoint, 3) table of random 64-bit keys,
+        one for each (point, EMPTY/BLACK/WHITE) pair.
+        The hash of a board is the XOR of the keys of all its non-BORDER points.
+        The generator is seeded with the board size, so that boards of
+        different sizes never share keys in the transposition table.
+        """
+        rng = np.random.default_rng(self.size)
+        return rng.integers(0, 2**63, size=(self.maxpoint, 3), dtype=np.uint64)
+
+    def _initialize_zobrist_moves(self) -> list:
+        """
+        Creates and returns a nested (maxpoint x 3 x 8) list where entry [point][color][k]
+        is the change (XOR) in the hash of the k-th symmetric transformation
+        of the board when a stone of color is placed on the EMPTY point.
+        Python ints are used, since they are cheaper than numpy scalars
+        for the per-move updates in play_move/undo_move.
+        A point read at position m by sym_points[k] is hashed with the key of
+        the m-th non-BORDER point, i.e. where it lands in the transformed board.
         """
-        dict = {}
-        for point in range(self.maxpoint):
-            if self.board[point] != EMPTY:
-                continue
-            arr = []
-            neighbors = self._neighbors(point)
-            for nb in neighbors:
-                if self.board[nb] == EMPTY:
-                    arr.append(nb)
-                dict[point] = arr
-        return dict
+        base = self.sym_points[0]
+        zobrist_moves = np.zeros((self.maxpoint, 3, 8), dtype=np.uint64)
+        for k, sym in enumerate(self.sym_points):
+            zobrist_moves[sym, :, k] = self.zobrist[base] ^ self.zobrist[base, EMPTY][:, None]
+        return zobrist_moves.tolist()
+
+    def _initialize_zobrist_to_play(self) -> list:
+        """
+        Creates and returns a list of random 64-bit keys indexed by color,
+        XORed into the transposition table key so that the same board
+        with BLACK or with WHITE to play are stored as different states.
+        """
+        rng = np.random.default_rng([self.size, _ZOBRIST_TO_PLAY_SEED])
+        return [0] + rng.integers(0, 2**63, size=2, dtype=np.uint64).tolist()
 
 
     def is_eye(self, point: GO_POINT, color: GO_COLOR) -> bool:
@@ -367,68 +368,103 @@ class GoBoard(object):
         if not self._is_surrounded(point, color):
             return False
         # Eye-like shape. Check diagonals to detect false eye
-        opp_color = opponent(color)
+        board = self.board
+        opp_color = _OPPONENT[color]
         false_count = 0
-        at_edge = 0
-        for d in self._diag_neighbors(point):
-            if self.board[d] == BORDER:
-                at_edge = 1
-            elif self.board[d] == opp_color:
+        for d in self.non_border_diag_neighbors[point]:
+            if board[d] == opp_color:
                 false_count += 1
-        return false_count <= 1 - at_edge  # 0 at edge, 1 in center
+        return false_count <= 1 - self.diag_at_edge[point]  # 0 at edge, 1 in center
         
         
+    def eye_bitboard(self, color: GO_COLOR) -> int:
+        """
+        Return the bitboard of all EMPTY points which are simple eyes for color,
+        i.e. is_eye for every EMPTY point at once.
+        """
+        bitboards = self.bitboards
+        empty = bitboards[EMPTY]
+        NS = self.NS
+        # EMPTY points with no EMPTY or opponent neighbor
+        not_own = empty | bitboards[_OPPONENT[color]]
+        surrounded = empty & ~(not_own << 1 | not_own >> 1 | not_own << NS | not_own >> NS)
+        # EMPTY points with at least one/two diagonal opponent stones
+        opp = bitboards[_OPPONENT[color]]
+        one = two = 0
+        for diag in (opp << NS - 1, opp >> NS - 1, opp << NS + 1, opp >> NS + 1):
+            two |= one & diag
+            one |= diag
+        return surrounded & ~(two | one & self.diag_at_edge_bits)
+
     def _is_surrounded(self, point: GO_POINT, color: GO_COLOR) -> bool:
         """
         check whether empty point is surrounded by stones of color
         (or BORDER) neighbors
         """
-        for nb in self._neighbors(point):
-            nb_color = self.board[nb]
+        board = self.board
+        NS = self.NS
+        for nb in (point - 1, point + 1, point - NS, point + NS):
+            nb_color = board[nb]
             if nb_color != BORDER and nb_color != color:
                 return False
         return True
 
 
-    def _has_liberty(self, block: np.ndarray) -> bool:
+    def _has_liberty(self, block: set) -> bool:
         """
         Check if the given block has any liberty.
-        block is a numpy boolean array
-        """
-        for stone in where1d(block):
-            if self.find_neighbor_of_color(stone, EMPTY):
-                return True
+        block is a set of points
+        """
+        board = self.board
+        neighbors = self.non_border_neighbors
+        for stone in block:
+            for nb in neighbors[stone]:
+                if board[nb] == EMPTY:
+                    return True
         return False
         
         
-    def _block_of(self, stone: GO_POINT) -> np.ndarray:
+    def _block_has_liberty(self, stone: GO_POINT) -> bool:
+        """
+        Check if the block of given stone has any liberty.
+        The block is flooded on the bitboards, as in is_legal.
+        """
+        color: GO_COLOR = self.board[stone]
+        assert color == BLACK or color == WHITE
+        bitboards = self.bitboards
+        block = self._flood(self.point_bits[stone], bitboards[color])
+        return self._dilate(block) & bitboards[EMPTY] != 0
+
+
+    def _block_of(self, stone: GO_POINT) -> set:
         """
         Find the block of given stone
-        Returns a board of boolean markers which are set for
-        all the points in the block 
+        Returns the set of all the points in the block 
         """
-        color: GO_COLOR = self.get_color(stone)
-        assert is_black_white(color)
-        return self.connected_component(stone)
+        assert self.board[stone] == BLACK or self.board[stone] == WHITE
+        return self.connected_component_set(stone)
 
 
     def connected_component(self, point: GO_POINT) -> np.ndarray:
         """
         Find the connected component of the given point.
+        Returns a board of boolean markers which are set for
+        all the points in the component
         """
         marker = np.full(self.maxpoint, False, dtype=np.bool_)
-        pointstack = [point]
-        color: GO_COLOR = self.get_color(point)
-        assert is_black_white_empty(color)
-        marker[point] = True
-        while pointstack:
-            p = pointstack.pop()
-            neighbors = self.neighbors_of_color(p, color)
-            for nb in neighbors:
-                if not marker[nb]:
-                    marker[nb] = True
-                    pointstack.append(nb)
+        marker[list(self.connected_component_set(point))] = True
         return marker
+
+
+    def connected_component_set(self, point: GO_POINT) -> set:
+        """
+        Find the connected component of the given point.
+        Returns the set of all the points in the component
+        The component is flooded on the bitboard of the point's color,
+        then its set bits are read back as points.
+        """
+        component_bits = self._flood(self.point_bits[point], self.bitboards[self.board[point]])
+        return set(self._bits_to_points(component_bits))
         
         
     def _detect_and_process_capture(self, nb_point: GO_POINT) -> GO_POINT:
@@ -438,12 +474,17 @@ class GoBoard(object):
         Returns the stone if only a single stone was captured,
         and returns NO_POINT otherwise.
         """
-        opp_block = self._block_of(nb_point)
-        return not self._has_liberty(opp_block)
+        return not self._block_has_liberty(nb_point)
 
 
     def undo_move(self, point: GO_POINT):
+        color = self.board[point]
+        self.hashes = list(map(xor, self.hashes, self.zobrist_moves[point][color]))
+        self.bitboards[color] ^= self.point_bits[point]
+        self.bitboards[EMPTY] ^= self.point_bits[point]
         self.board[point] = EMPTY
+        self._empty_set.add(point)
+        self.current_player = int(color)
 
 
     def play_move(self, point: GO_POINT, color: GO_COLOR):
@@ -452,28 +493,45 @@ class GoBoard(object):
         Returns whether move was legal
         """
         self.board[point] = color
-        #self.current_player = opponent(color)
+        self.hashes = list(map(xor, self.hashes, self.zobrist_moves[point][color]))
+        self._empty_set.discard(point)
+        self.bitboards[color] ^= self.point_bits[point]
+        self.bitboards[EMPTY] ^= self.point_bits[point]
+        self.current_player = _OPPONENT[color]
+
+
+    def try_play(self, point: GO_POINT, color: GO_COLOR) -> bool:
+        """
+        Play a move of color on point if it is legal.
+        Returns whether the move was played; the board is unchanged otherwise.
+        """
+        if self.board[point] != EMPTY or not self.is_legal(point, color):
+            return False
+        self.play_move(point, color)
+        return True
 
 
     def neighbors_of_color(self, point: GO_POINT, color: GO_COLOR) -> List:
         """ List of neighbors of point of given color """
+        board = self.board
+        NS = self.NS
         nbc: List[GO_POINT] = []
-        for nb in self._neighbors(point):
-            if self.get_color(nb) == color:
+        for nb in (point - 1, point + 1, point - NS, point + NS):
+            if board[nb] == color:
                 nbc.append(nb)
         return nbc
 
 
-    def _neighbors(self, point: GO_POINT) -> List:
-        """ List of all four neighbors of the point """
-        return [point - 1, point + 1, point - self.NS, point + self.NS]
+    def _neighbors(self, point: GO_POINT) -> Tuple:
+        """ Tuple of all four neighbors of the point """
+        return (point - 1, point + 1, point - self.NS, point + self.NS)
 
-    def _diag_neighbors(self, point: GO_POINT) -> List:
-        """ List of all four diagonal neighbors of point """
-        return [point - self.NS - 1,
+    def _diag_neighbors(self, point: GO_POINT) -> Tuple:
+        """ Tuple of all four diagonal neighbors of point """
+        return (point - self.NS - 1,
                 point - self.NS + 1,
                 point + self.NS - 1,
-                point + self.NS + 1]
+                point + self.NS + 1)
 
     def last_board_moves(self) -> List:
         """
@@ -483,21 +541,21 @@ class GoBoard(object):
         board_moves: List[GO_POINT] = []
         return board_moves
 
-    def get_twoD_board(self) -> np.ndarray:
+    def get_twoD_board(self, copy: bool = True) -> np.ndarray:
         """
         Return: numpy array
         a two dimensional numpy array with the goboard.
         Shows stones and empty points as encoded in board_base.py.
         Result is not padded with BORDER points.
         Rows 1..size of goboard are copied into rows 0..size - 1 of board2d
-        Then the board is flipped up-down to be consistent with the
-        coordinate system in GoGui (row 1 at the bottom).
-        """
-        board2d: np.ndarray[GO_POINT] = np.zeros((self.size, self.size), dtype=GO_POINT)
-        for row in range(self.size):
-            # get start square for this row
-            start: int = (row + 1) * self.NS + 1
-            # set row elements of board2d as all specified elements in go_board.board
-            board2d[row, :] = self.board[start : start + self.size]
-        #board2d = np.flipud(board2d)
+        The rows are read as one contiguous block of self.board, reshaped
+        to rows of NS points, with the BORDER column dropped.
+        If copy is False, a read-only view of self.board is returned instead of a copy.
+        """
+        start: int = self.NS + 1
+        rows: np.ndarray = self.board[start : start + self.size * self.NS].reshape(self.size, self.NS)
+        board2d: np.ndarray[GO_POINT] = rows[:, :self.size]
+        if copy:
+            return np.ascontiguousarray(board2d)
+        board2d.flags.writeable = False
         return board2d
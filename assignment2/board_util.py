@@ -25,14 +25,7 @@ class GoBoardUtil(object):
         color:
             the color to generate the move for.
         """
-        moves: np.ndarray[GO_POINT] = board.get_empty_points()
-        legal_moves: List[GO_POINT] = []
-        
-        for move in moves:
-            #if board.is_legal_original(move, color):
-            if board.is_legal(move, color):
-                legal_moves.append(move)
-        return legal_moves
+        return board.legal_moves(color)
 
 
     @staticmethod
@@ -47,14 +40,17 @@ class GoBoardUtil(object):
         color:
             the color to generate the move for.
         """
-        prioritized_moves = []
+        eyes: int = board.eye_bitboard(color)
+        point_bits = board.point_bits
+        non_eye_moves: List[GO_POINT] = []
+        eye_moves: List[GO_POINT] = []
         for move in legal_moves:
             # if move would entail placing a stone in player's own eye
-            if not board.is_eye(move, color):
-                prioritized_moves.insert(0,move)
+            if point_bits[move] & eyes:
+                eye_moves.append(move)
             else:
-                prioritized_moves.append(move)        
-        return prioritized_moves
+                non_eye_moves.append(move)
+        return non_eye_moves + eye_moves
 
 
     @staticmethod
@@ -70,9 +66,13 @@ class GoBoardUtil(object):
         color : BLACK, WHITE
             the color to generate the move for.
         """
-        moves: np.ndarray[GO_POINT] = board.get_empty_points()
-        np.random.shuffle(moves)
-        for move in moves:
+        moves: List[GO_POINT] = board.get_empty_points().tolist()
+        # draw the moves in random order, only as far as the first legal one
+        while moves:
+            i: int = random.randrange(len(moves))
+            move: GO_POINT = moves[i]
+            moves[i] = moves[-1]
+            moves.pop()
             legal: bool = not (
                 use_eye_filter and board.is_eye(move, color)
             ) and board.is_legal(move, color)
@@ -86,15 +86,10 @@ class GoBoardUtil(object):
         """
         Return a list of random (legal) moves with eye-filtering.
         """
-        empty_points: np.ndarray[GO_POINT] = board.get_empty_points()
         color: GO_COLOR = board.current_player
         moves: List[GO_POINT] = []
-        for move in empty_points:
-            legal: bool = \
-                not (
-                    use_eye_filter and board.is_eye(move, color)
-                ) and board.is_legal(move, color)
-            if legal:
+        for move in board.legal_moves(color):
+            if not (use_eye_filter and board.is_eye(move, color)):
                 moves.append(move)
         return moves
         
@@ -109,13 +104,8 @@ class GoBoardUtil(object):
         Rows 1..size of goboard are copied into rows 0..size - 1 of board2d
         Then the board is flipped up-down to be consistent with the
         coordinate system in GoGui (row 1 at the bottom).
+        The rows are taken as a view by GoBoard.get_twoD_board,
+        so the only copy made is the flipped result.
         """
-        size: int = go_board.size
-        board2d: np.ndarray[GO_POINT] = np.zeros((size, size), dtype=GO_POINT)
-        for row in range(size):
-            # get start square for this row
-            start: int = go_board.row_start(row + 1)
-            # set row elements of board2d as all specified elements in go_board.board
-            board2d[row, :] = go_board.board[start : start + size]
-        board2d = np.flipud(board2d)
-        return board2d
+        board2d: np.ndarray[GO_POINT] = np.flipud(go_board.get_twoD_board(copy=False))
+        return np.ascontiguousarray(board2d)
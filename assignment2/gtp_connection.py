@@ -17,12 +17,31 @@ from typing import Any, Callable, Dict, List, Tuple
 import numpy as np
 from board import GoBoard
 from board_base import (BLACK, BORDER, EMPTY, GO_COLOR, GO_POINT, MAXSIZE,
-                        WHITE, coord_to_point, is_black_white, opponent)
+                        WHITE, board_array_size, coord_to_point, is_black_white,
+                        opponent)
 from board_util import GoBoardUtil
 from engine import GoEngine
 
+"""
+Leading command id of a GTP command, as used in regression tests
+"""
+_LEADING_DIGITS = re.compile(r"^\d+")
+
 
 class GtpConnection:
+    # argmap is used for argument checking
+    # values: (required number of arguments,
+    #          error message on argnum failure)
+    # It is the same for every connection, so it is shared by the class.
+    argmap: Dict[str, Tuple[int, str]] = {
+        "boardsize": (1, "Usage: boardsize INT"),
+        "komi": (1, "Usage: komi FLOAT"),
+        "known_command": (1, "Usage: known_command CMD_NAME"),
+        "genmove": (1, "Usage: genmove {w,b}"),
+        "play": (2, "Usage: play {b,w} MOVE"),
+        "legal_moves": (1, "Usage: legal_moves {w,b}"),
+    }
+
     def __init__(self, go_engine: GoEngine, board: GoBoard, debug_mode: bool = False, max_seconds: int = 0) -> None:
         """
         Manage a GTP connection for a Go-playing engine
@@ -38,6 +57,8 @@ class GtpConnection:
         self.go_engine = go_engine
         self.board: GoBoard = board
         self.max_seconds = max_seconds
+        # number of nodes visited by the current solve/genmove, used to sample the time limit check
+        self._nodes: int = 0
         self.commands: Dict[str, Callable[[List[str]], None]] = {
             "protocol_version": self.protocol_version_cmd,
             "quit": self.quit_cmd,
@@ -58,18 +79,6 @@ class GtpConnection:
             "timelimit": self.timelimit_cmd
         }
 
-        # argmap is used for argument checking
-        # values: (required number of arguments,
-        #          error message on argnum failure)
-        self.argmap: Dict[str, Tuple[int, str]] = {
-            "boardsize": (1, "Usage: boardsize INT"),
-            "komi": (1, "Usage: komi FLOAT"),
-            "known_command": (1, "Usage: known_command CMD_NAME"),
-            "genmove": (1, "Usage: genmove {w,b}"),
-            "play": (2, "Usage: play {b,w} MOVE"),
-            "legal_moves": (1, "Usage: legal_moves {w,b}"),
-        }
-
     def write(self, data: str) -> None:
         stdout.write(data)
 
@@ -90,13 +99,13 @@ class GtpConnection:
         """
         Parse command string and execute it
         """
-        if len(command.strip(" \r\t")) == 0:
+        if not command.strip():
             return
         if command[0] == "#":
             return
         # Strip leading numbers from regression tests
         if command[0].isdigit():
-            command = re.sub("^\d+", "", command).lstrip()
+            command = _LEADING_DIGITS.sub("", command).lstrip()
         elements: List[str] = command.split()
         if not elements:
             return
@@ -212,10 +221,8 @@ class GtpConnection:
         board_color: str = args[0].lower()
         color: GO_COLOR = color_to_int(board_color)
         moves: List[GO_POINT] = GoBoardUtil.generate_legal_moves(self.board, color)
-        gtp_moves: List[str] = []
-        for move in moves:
-            coords: Tuple[int, int] = point_to_coord(move, self.board.size)
-            gtp_moves.append(format_point(coords))
+        point_to_gtp: List[str] = point_to_gtp_table(self.board.size)
+        gtp_moves: List[str] = [point_to_gtp[move] for move in moves]
         sorted_moves = " ".join(sorted(gtp_moves))
         self.respond(sorted_moves)
         
@@ -282,11 +289,11 @@ class GtpConnection:
     def gogui_rules_legal_moves_cmd(self, args):
         # get all the legal moves
         legal_moves = GoBoardUtil.generate_legal_moves(self.board, self.board.current_player)
-        coords = [point_to_coord(move, self.board.size) for move in legal_moves]
         # convert to point strings
-        point_strs  = [ chr(ord('a') + col - 1) + str(row) for row, col in coords]
+        point_to_gtp = point_to_gtp_table(self.board.size)
+        point_strs = [point_to_gtp[move] for move in legal_moves]
         point_strs.sort()
-        point_strs = ' '.join(point_strs).upper()
+        point_strs = ' '.join(point_strs)
         self.respond(point_strs)
         return
         
@@ -299,8 +306,7 @@ class GtpConnection:
     """
     def gogui_rules_final_result_cmd(self, args):
         """ Implement this method correctly """
-        legal_moves = GoBoardUtil.generate_legal_moves(self.board, self.board.current_player)
-        if len(legal_moves) > 0:
+        if self.board.has_any_legal_move(self.board.current_player):
             self.respond('unknown')
         elif self.board.current_player == BLACK:
             self.respond('')
@@ -326,12 +332,10 @@ class GtpConnection:
                     "Error executing move {} converted from {}".format(move, args[1])
                 )
                 return
-            if not self.board.is_empty(move) or not self.board.is_legal(move, color):
+            if not self.board.try_play(move, color):
                 self.respond('illegal move')
                 return
             else:
-                self.board.play_move(move, color)
-                self.board.current_player = opponent(color)
                 self.debug_msg(
                     "Move: {}\nBoard:\n{}\n".format(board_move, self.board2d())
                 )
@@ -348,12 +352,16 @@ class GtpConnection:
         If solve() returns False, play a random move     
         """
         start_time = time.process_time()
+        self._nodes = 0
         board_color = args[0].lower()
         color = color_to_int(board_color)
-        empty_points = self.board.get_empty_points()
-        empty_points_set = set(empty_points)
-        move = self.get_outcome(color, empty_points_set, start_time)
+        # TT keys include the player to move, so search with color to move at the root
+        # and restore the player to move afterwards
+        player_to_move = self.board.current_player
+        self.board.current_player = color
+        move = self.get_outcome(color, start_time)
         winner = self.board.get_tt_entry()
+        self.board.current_player = player_to_move
         if winner == color:
             move_coord = point_to_coord(move, self.board.size)
             move_as_string = format_point(move_coord)
@@ -367,15 +375,13 @@ class GtpConnection:
             
         move_coord = point_to_coord(move, self.board.size)
         move_as_string = format_point(move_coord)
-        if self.board.is_legal(move, color):
-            self.board.play_move(move, color)
-            self.board.current_player = opponent(color)
+        if self.board.try_play(move, color):
             self.respond(move_as_string)
         else:
             self.respond("Illegal move: {}".format(move_as_string))
     
 
-    def get_all_outcomes(self, color, empty_points: set, start_time) -> dict:
+    def get_all_outcomes(self, color, start_time) -> dict:
         """
         Attempts to solve a go board
         @return: a winning move for the board state, if one exists for the current color; else None
@@ -383,14 +389,14 @@ class GtpConnection:
         board - the current state of the board
         color - corresponds to the player who's turn it is
         """
-        print(time.process_time() - start_time)
-        if time.process_time() - start_time > self.max_seconds:
+        # check the clock at the root (node 1) and every 1024 nodes after it
+        self._nodes += 1
+        if self._nodes & 1023 == 1 and time.process_time() - start_time > self.max_seconds:
             return
+        opp_color = opponent(color)
         #legal_moves = GoBoardUtil.prioritize_legal_moves(self.board, legal_moves, color)
         winning_moves = []
-        for move in empty_points:
-            if not self.board.is_legal(move, color):
-                continue
+        for move in self.board.legal_moves(color):
             self.board.play_move(move, color)
 
             winning_color = self.board.get_tt_entry()
@@ -405,9 +411,7 @@ class GtpConnection:
                 continue
 
             # else outcome not in tt
-            empty_points_copy = empty_points.copy()
-            empty_points_copy.remove(move)
-            self.get_all_outcomes(opponent(color), empty_points_copy, start_time)
+            self.get_outcome(opp_color, start_time)
 
             winner = self.board.get_tt_entry()
             if not winner:
@@ -421,15 +425,16 @@ class GtpConnection:
                 # set board state as a win for the current player
                 self.board.set_tt_entry(color)
                 #return move
+                continue
 
             self.board.undo_move(move)
         # if no legal_moves are all legal_moves are losing
         if winning_moves:
             return winning_moves
-        self.board.set_tt_entry(opponent(color))
+        self.board.set_tt_entry(opp_color)
 
     
-    def get_outcome(self, color, empty_points: set, start_time):
+    def get_outcome(self, color, start_time):
         """
         Attempts to solve a go board
         @return: a winning move for the board state, if one exists for the current color; else None
@@ -437,12 +442,13 @@ class GtpConnection:
         board - the current state of the board
         color - corresponds to the player who's turn it is
         """
-        print(time.process_time() - start_time)
-        if time.process_time() - start_time > self.max_seconds:
+        # check the clock at the root (node 1) and every 1024 nodes after it
+        self._nodes += 1
+        if self._nodes & 1023 == 1 and time.process_time() - start_time > self.max_seconds:
             return
-        for move in empty_points:
-            if not self.board.is_legal(move, color):
-                continue
+        opp_color = opponent(color)
+        legal_moves = GoBoardUtil.prioritize_legal_moves(self.board, self.board.legal_moves(color), color)
+        for move in legal_moves:
             self.board.play_move(move, color)
 
             winning_color = self.board.get_tt_entry()
@@ -456,10 +462,8 @@ class GtpConnection:
                 # else move was win for opponent(color)
                 continue
 
-            empty_points_copy = empty_points.copy()
-            empty_points_copy.remove(move)
             # else outcome not in tt
-            self.get_outcome(opponent(color), empty_points_copy, start_time)
+            self.get_outcome(opp_color, start_time)
 
             winner = self.board.get_tt_entry()
             if not winner:
@@ -474,7 +478,7 @@ class GtpConnection:
 
             self.board.undo_move(move)
         # if no legal_moves or all legal_moves are losing
-        self.board.set_tt_entry(opponent(color))
+        self.board.set_tt_entry(opp_color)
             
             
     def solve_cmd(self, args: List[str]) -> None:
@@ -489,10 +493,9 @@ class GtpConnection:
         - If the winner {"b" or "w"} is not the current player, then no move should be included. 
         """
         start_time = time.process_time()
-        empty_points = self.board.get_empty_points()
-        empty_points_set = set(empty_points)
-        # move = self.get_outcome(self.board.current_player, empty_points_set, start_time)
-        winning_moves = self.get_all_outcomes(self.board.current_player, empty_points_set, start_time)
+        self._nodes = 0
+        # move = self.get_outcome(self.board.current_player, start_time)
+        winning_moves = self.get_all_outcomes(self.board.current_player, start_time)
         winner = self.board.get_tt_entry()
         # if timeout
         if not winner:
@@ -532,14 +535,44 @@ def point_to_coord(point: GO_POINT, boardsize: int) -> Tuple[int, int]:
     return divmod(point, NS)
 
 
+"""
+GTP strings of all (row, col) coordinates of boards up to MAXSIZE, used by format_point
+"""
+assert MAXSIZE <= 25
+_FORMAT_POINT: Dict[Tuple[int, int], str] = {
+    (row, col): "ABCDEFGHJKLMNOPQRSTUVWXYZ"[col - 1] + str(row)
+    for row in range(1, MAXSIZE + 1)
+    for col in range(1, MAXSIZE + 1)
+}
+
+
 def format_point(move: Tuple[int, int]) -> str:
     """
     Return move coordinates as a string such as 'A1'
     """
-    assert MAXSIZE <= 25
-    column_letters = "ABCDEFGHJKLMNOPQRSTUVWXYZ"
-    row, col = move
-    return column_letters[col - 1] + str(row)
+    return _FORMAT_POINT[move]
+
+
+"""
+GTP strings of the points of each board size, built on first use by point_to_gtp_table
+"""
+_POINT_TO_GTP: Dict[int, List[str]] = {}
+
+
+def point_to_gtp_table(boardsize: int) -> List[str]:
+    """
+    Return a list indexed by board array index, holding the GTP string
+    (such as 'A1') of each point of a board of given size,
+    and "" for BORDER points.
+    """
+    table = _POINT_TO_GTP.get(boardsize)
+    if table is None:
+        table = [""] * board_array_size(boardsize)
+        for row in range(1, boardsize + 1):
+            for col in range(1, boardsize + 1):
+                table[coord_to_point(row, col, boardsize)] = format_point((row, col))
+        _POINT_TO_GTP[boardsize] = table
+    return table
 
 
 def move_to_coord(point_str: str, board_size: int) -> Tuple[int, int]: